@@ -6,39 +6,111 @@ This script accepts a YouTube video URL (or share link) and downloads its transc
 in the `transcripts/` directory. Filenames are based on the video title (sanitized) or video ID as fallback.
 
 Prerequisites:
-    pip install youtube-transcript-api pytube requests
+    pip install youtube-transcript-api pytube requests tenacity diskcache
 
 Usage:
-    python youtube_transcript_extractor.py <video_url> [-l LANG1 LANG2 ...] [-o OUTPUT_FILE]
+    python youtube_transcript_extractor.py <video_url> [-l LANG1 LANG2 ...] [-o OUTPUT_FILE] [--no-cache]
+    python youtube_transcript_extractor.py --batch URLS_FILE [-j JOBS] [-l LANG1 LANG2 ...] [--no-cache]
 
 Example:
     python youtube_transcript_extractor.py https://youtu.be/dQw4w9WgXcQ -l en es
+    python youtube_transcript_extractor.py --batch urls.txt -j 4
 """
 import argparse
+import asyncio
 import os
 import re
 import sys
+import threading
 from urllib.error import HTTPError
+import diskcache
 import requests
-from youtube_transcript_api import YouTubeTranscriptApi, NoTranscriptFound, TranscriptsDisabled
+from requests.adapters import HTTPAdapter
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
+from youtube_transcript_api import (
+    YouTubeTranscriptApi, NoTranscriptFound, TranscriptsDisabled, RequestBlocked, YouTubeRequestFailed
+)
 from pytube import YouTube
 
 
+def make_session() -> requests.Session:
+    """
+    Builds a requests session with a pooled HTTPS adapter so repeated requests reuse connections.
+    """
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=20))
+    session.headers["User-Agent"] = "Mozilla/5.0"
+    return session
+
+
+# Shared HTTP session (title scraping + transcript API) to avoid a TCP/TLS handshake per request
+SESSION = make_session()
+YTT_API = YouTubeTranscriptApi(http_client=SESSION)
+
+# Batch mode fetches from worker threads; sessions aren't thread-safe, so each thread gets its own
+_thread_clients = threading.local()
+
+# Retry transient network failures and YouTube throttling (429/5xx) with jittered exponential backoff.
+# reraise=True hands the last original exception to the caller instead of tenacity's RetryError.
+network_retry = retry(
+    retry=retry_if_exception_type(
+        (HTTPError, requests.RequestException, RequestBlocked, YouTubeRequestFailed)
+    ),
+    wait=wait_exponential_jitter(initial=1, max=30),
+    stop=stop_after_attempt(5),
+    reraise=True,
+)
+
+# Patterns compiled once at import instead of on every call
+_VIDEO_ID_RE = re.compile(r"(?:v=|\/)([0-9A-Za-z_-]{11})(?:\?|&|#|$)")
+_VIDEO_ID_CHARS_RE = re.compile(r"[0-9A-Za-z_-]{11}")
+_OG_TITLE_RE = re.compile(r'<meta property="og:title" content="(.*?)"')
+_TITLE_TAG_RE = re.compile(r'<title>(.*?)</title>', re.IGNORECASE)
+_UNSAFE_FILENAME_RE = re.compile(r'[\\/*?:"<>|]')
+
+# Fetched titles/transcripts are memoized on disk so re-runs skip the network entirely
+CACHE_DIR = os.path.join(".cache", "yt")
+CACHE_EXPIRE = 7 * 86400  # seconds
+
+
 def extract_video_id(url: str) -> str:
     """
     Extracts the 11-character YouTube video ID from a URL or share link.
     Raises ValueError if no valid ID is found.
     """
-    pattern = r"(?:v=|\/)([0-9A-Za-z_-]{11})(?:\?|&|#|$)"
-    match = re.search(pattern, url)
-    if match:
-        return match.group(1)
+    # Fast path for the common forms (youtu.be/<id>, watch?v=<id>): plain string
+    # searches, then the same 11-character/terminator rules as _VIDEO_ID_RE
+    start = url.find("youtu.be/")
+    if start != -1:
+        start += 9
+    else:
+        start = url.find("?v=")
+        if start == -1:
+            start = url.find("&v=")
+        if start != -1:
+            start += 3
+    if start != -1:
+        end = start + 11
+        if url[end:end + 1] in ("", "?", "&", "#") and _VIDEO_ID_CHARS_RE.fullmatch(url, start, end):
+            return url[start:end]
+
+    # Fallback for /shorts/, /embed/, /live/ and other forms
+    match = _VIDEO_ID_RE.search(url)
+    while match:
+        start = match.start()
+        # A `v=` match only counts as the start of a parameter (not e.g. inside `?dev=...`).
+        # Checked here rather than in the pattern, which keeps the regex's fast literal scan.
+        if url[start] == "/" or start == 0 or url[start - 1] in "?&#":
+            return match.group(1)
+        match = _VIDEO_ID_RE.search(url, start + 1)
     raise ValueError(f"Invalid YouTube URL or missing video ID: {url}")
 
 
-def fetch_video_title(url: str) -> str:
+@network_retry
+def fetch_video_title(url: str, session: requests.Session = None) -> str:
     """
     Tries to fetch YouTube video title via pytube, falls back to scraping page HTML.
+    The fallback uses `session` (default: the shared SESSION).
     """
     # Primary method: pytube
     try:
@@ -47,33 +119,37 @@ def fetch_video_title(url: str) -> str:
     except Exception:
         pass
     # Fallback: HTTP GET + regex on meta tags or title tag
-    response = requests.get(url)
+    response = (session or SESSION).get(url, timeout=10)
     response.raise_for_status()
     html = response.text
     # Try Open Graph title
-    og = re.search(r'<meta property="og:title" content="(.*?)"', html)
+    og = _OG_TITLE_RE.search(html)
     if og:
         return og.group(1)
     # Try <title> tag
-    title_tag = re.search(r'<title>(.*?)</title>', html, re.IGNORECASE)
+    title_tag = _TITLE_TAG_RE.search(html)
     if title_tag:
         title_raw = title_tag.group(1)
         return title_raw.replace(' - YouTube', '').strip()
     raise Exception("Could not retrieve video title from HTML")
 
 
-def fetch_transcript(video_id: str, languages: list = None) -> list:
+@network_retry
+def fetch_transcript(video_id: str, languages: list = None, api: YouTubeTranscriptApi = None) -> list:
     """
     Fetches transcript segments for a given video ID (prefers manual, then auto-generated).
     If `languages` provided, tries transcripts in that order.
+    Uses `api` (default: the shared YTT_API) for requests.
     Returns a list of dicts with 'text', 'start', 'duration'.
+    Transient network errors are retried with backoff before being raised.
     Raises NoTranscriptFound, TranscriptsDisabled
     """
+    api = api or YTT_API
     try:
         # direct fetch (auto or manual)
-        return YouTubeTranscriptApi.get_transcript(video_id)
+        return api.fetch(video_id, languages=languages or ("en",)).to_raw_data()
     except HTTPError:
-        transcripts = YouTubeTranscriptApi.list_transcripts(video_id)
+        transcripts = api.list(video_id)
         if languages:
             transcripts = transcripts.find_transcript(languages)
         else:
@@ -85,7 +161,39 @@ def fetch_transcript(video_id: str, languages: list = None) -> list:
                 transcripts = transcripts.find_generated_transcript(
                     [t.lang_code for t in transcripts.generated_transcripts]
                 )
-        return transcripts.fetch()
+        return transcripts.fetch().to_raw_data()
+
+
+def fetch_video_title_cached(video_id: str, url: str, cache: diskcache.Cache = None,
+                             session: requests.Session = None) -> str:
+    """
+    Returns the video title from `cache` if present, otherwise fetches and stores it.
+    With no cache, this is a plain fetch_video_title call.
+    """
+    if cache is None:
+        return fetch_video_title(url, session)
+    key = ("title", video_id)
+    title = cache.get(key)
+    if title is None:
+        title = fetch_video_title(url, session)
+        cache.set(key, title, expire=CACHE_EXPIRE)
+    return title
+
+
+def fetch_transcript_cached(video_id: str, languages: list = None, cache: diskcache.Cache = None,
+                            api: YouTubeTranscriptApi = None) -> list:
+    """
+    Returns the transcript from `cache` if present, otherwise fetches and stores it.
+    Entries are keyed by video ID and language preference.
+    """
+    if cache is None:
+        return fetch_transcript(video_id, languages, api)
+    key = ("transcript", video_id, tuple(languages or ()))
+    transcript = cache.get(key)
+    if transcript is None:
+        transcript = fetch_transcript(video_id, languages, api)
+        cache.set(key, transcript, expire=CACHE_EXPIRE)
+    return transcript
 
 
 def save_transcript(transcript: list, output_path: str, url: str, title: str) -> None:
@@ -102,11 +210,99 @@ def save_transcript(transcript: list, output_path: str, url: str, title: str) ->
             f.write(f"[{start:0.2f}] {text}\n")
 
 
+def download_transcript(video_id: str, languages: list = None, output_filename: str = None,
+                        cache: diskcache.Cache = None, session: requests.Session = None,
+                        api: YouTubeTranscriptApi = None) -> str:
+    """
+    Fetches the title and transcript for a video and saves it into the 'transcripts/' folder.
+    Falls back to the video ID if the title can't be fetched.
+    Returns the output path; raises whatever fetch_transcript raises.
+    """
+    canonical_url = f"https://www.youtube.com/watch?v={video_id}"
+
+    try:
+        title = fetch_video_title_cached(video_id, canonical_url, cache, session)
+        safe_title = _UNSAFE_FILENAME_RE.sub("_", title)
+    except Exception as e:
+        print(f"⚠️ Warning: Could not fetch title for {video_id} ({e}). Using video ID as title.")
+        title = video_id
+        safe_title = video_id
+
+    output_dir = "transcripts"
+    os.makedirs(output_dir, exist_ok=True)
+    default_name = f"{safe_title}_{video_id}_transcript.txt"
+    output_path = os.path.join(output_dir, output_filename or default_name)
+
+    transcript = fetch_transcript_cached(video_id, languages, cache, api)
+    save_transcript(transcript, output_path, canonical_url, title)
+    return output_path
+
+
+def describe_download_error(error: Exception) -> str:
+    """
+    Returns the user-facing message for an exception raised by download_transcript.
+    """
+    if isinstance(error, (NoTranscriptFound, TranscriptsDisabled)):
+        return "❌ No transcript available for this video."
+    if isinstance(error, HTTPError):
+        return f"❌ HTTP Error during transcript fetch: {error}. ``Transcript may not exist or access is restricted."
+    return f"❌ Unexpected Error: {error}"
+
+
+def download_transcript_in_thread(video_id: str, languages: list = None, cache: diskcache.Cache = None) -> str:
+    """
+    download_transcript for batch worker threads, using a session/API client owned by the
+    calling thread so connections are still reused across that thread's downloads.
+    """
+    if not hasattr(_thread_clients, "session"):
+        _thread_clients.session = make_session()
+        _thread_clients.api = YouTubeTranscriptApi(http_client=_thread_clients.session)
+    return download_transcript(video_id, languages, None, cache, _thread_clients.session, _thread_clients.api)
+
+
+async def download_batch(urls: list, languages: list = None, cache: diskcache.Cache = None,
+                         jobs: int = 4) -> int:
+    """
+    Downloads transcripts for many URLs concurrently, at most `jobs` at a time so YouTube
+    isn't hit hard enough to throttle. Prints each result as it completes.
+    Returns the number of failed URLs.
+    """
+    semaphore = asyncio.Semaphore(jobs)
+
+    async def worker(url: str):
+        try:
+            video_id = extract_video_id(url)
+        except ValueError as ve:
+            return url, f"❌ URL Error: {ve}", False
+        async with semaphore:
+            try:
+                # youtube-transcript-api is blocking (requests-based), so run it off the event loop
+                output_path = await asyncio.to_thread(download_transcript_in_thread, video_id, languages, cache)
+            except Exception as e:
+                return url, describe_download_error(e), False
+        return url, f"✅ Transcript saved: '{output_path}'", True
+
+    failures = 0
+    for result in asyncio.as_completed([worker(url) for url in urls]):
+        url, message, ok = await result
+        print(f"{message} [{url}]")
+        failures += not ok
+    return failures
+
+
+def read_batch_file(path: str) -> list:
+    """
+    Reads one URL per line from a file, skipping blank lines and '#' comments.
+    """
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Download YouTube transcript into 'transcripts/' folder"
     )
-    parser.add_argument("url", help="YouTube video URL or share link")
+    parser.add_argument("url", nargs='?', help="YouTube video URL or share link")
     parser.add_argument(
         "-l", "--languages", nargs='+',
         help="Preferred languages (ISO codes) in order. E.g., en es fr",
@@ -117,42 +313,52 @@ def main():
         help="Custom output filename (default: <sanitized_title>_<video_id>_transcript.txt)",
         default=None
     )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help=f"Always fetch from YouTube instead of reusing results cached in '{CACHE_DIR}'"
+    )
+    parser.add_argument(
+        "--batch", metavar="URLS_FILE",
+        help="Download transcripts for every URL in a file (one per line) concurrently",
+        default=None
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int,
+        help="Maximum concurrent downloads in batch mode (default: 4)",
+        default=4
+    )
     args = parser.parse_args()
 
+    if bool(args.url) == bool(args.batch):
+        parser.error("provide either a video URL or --batch URLS_FILE")
+    if args.batch and args.output:
+        parser.error("-o/--output can't be used with --batch")
+    if args.jobs < 1:
+        parser.error("-j/--jobs must be at least 1")
+
+    cache = None if args.no_cache else diskcache.Cache(CACHE_DIR)
+
+    if args.batch:
+        try:
+            urls = read_batch_file(args.batch)
+        except OSError as e:
+            print(f"❌ Could not read batch file: {e}")
+            sys.exit(1)
+        failures = asyncio.run(download_batch(urls, args.languages, cache, args.jobs))
+        print(f"Done: {len(urls) - failures} saved, {failures} failed.")
+        sys.exit(1 if failures else 0)
+
     try:
         video_id = extract_video_id(args.url.strip())
     except ValueError as ve:
         print(f"❌ URL Error: {ve}")
         sys.exit(1)
 
-    canonical_url = f"https://www.youtube.com/watch?v={video_id}"
-
     try:
-        title = fetch_video_title(canonical_url)
-        safe_title = re.sub(r'[\\/*?:"<>|]', "_", title)
-    except Exception as e:
-        print(f"⚠️ Warning: Could not fetch title ({e}). Using video ID as title.")
-        title = video_id
-        safe_title = video_id
-
-    output_dir = "transcripts"
-    os.makedirs(output_dir, exist_ok=True)
-    default_name = f"{safe_title}_{video_id}_transcript.txt"
-    output_filename = args.output or default_name
-    output_path = os.path.join(output_dir, output_filename)
-
-    try:
-        transcript = fetch_transcript(video_id, args.languages)
-        save_transcript(transcript, output_path, canonical_url, title)
+        output_path = download_transcript(video_id, args.languages, args.output, cache)
         print(f"✅ Transcript saved: '{output_path}'")
-    except (NoTranscriptFound, TranscriptsDisabled):
-        print("❌ No transcript available for this video.")
-        sys.exit(1)
-    except HTTPError as he:
-        print(f"❌ HTTP Error during transcript fetch: {he}. ``Transcript may not exist or access is restricted.")
-        sys.exit(1)
     except Exception as e:
-        print(f"❌ Unexpected Error: {e}")
+        print(describe_download_error(e))
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Check that dir_diff_checker.iter_diff reports results in a deterministic, path-sorted order.
+
+Builds two temporary directory trees with added, deleted, modified, identical and
+unreadable files (large files early in path order, so comparisons finish out of
+order), runs iter_diff several times and verifies every run yields the same
+sequence, sorted by path components.
+
+Usage:
+    python check_dir_diff_order.py
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+from dir_diff_checker import MAX_PENDING_COMPARES, compare_directories, iter_diff
+
+RUNS = 5
+# Enough common files to overflow the result FIFO several times over
+FILE_COUNT = max(MAX_PENDING_COMPARES * 3, 400)
+
+
+def write_file(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def build_trees(root):
+    """Create root/a and root/b with a mix of differences, more files than the result FIFO holds."""
+    dir1 = os.path.join(root, 'a')
+    dir2 = os.path.join(root, 'b')
+    big = os.urandom(2 << 20)
+    for i in range(FILE_COUNT):
+        rel = os.path.join(f"d{i % 7}", f"f{i:04d}.txt")
+        # Big identical files are slow to compare, small ones fast
+        data = big if i % 25 == 0 else f"line {i}\n".encode()
+        write_file(os.path.join(dir1, rel), data)
+        if i % 11 == 0:
+            data = data[:-1] + b"!"
+        write_file(os.path.join(dir2, rel), data)
+    write_file(os.path.join(dir1, 'only1', 'deleted.txt'), b"gone\n")
+    write_file(os.path.join(dir2, 'only2', 'added.txt'), b"new\n")
+    write_file(os.path.join(dir1, 'd3.txt'), b"file in one tree\n")
+    write_file(os.path.join(dir2, 'd3.txt', 'nested.txt'), b"directory in the other\n")
+    os.symlink('/nonexistent', os.path.join(dir1, 'broken.txt'))
+    os.symlink('/nonexistent', os.path.join(dir2, 'broken.txt'))
+    return dir1, dir2
+
+
+def main():
+    root = tempfile.mkdtemp()
+    try:
+        dir1, dir2 = build_trees(root)
+        runs = [list(iter_diff(dir1, dir2)) for _ in range(RUNS)]
+
+        for run in runs[1:]:
+            assert run == runs[0], "iter_diff order differs between runs"
+
+        keys = [file.split(os.sep) for _, file, _ in runs[0]]
+        assert keys == sorted(keys), "iter_diff results are not in path order"
+
+        results = compare_directories(dir1, dir2)
+        assert len(runs[0]) == sum(len(files) for files in results.values()), "iter_diff lost or duplicated results"
+    finally:
+        shutil.rmtree(root)
+
+    print(f"OK: {RUNS} runs, {len(runs[0])} results each, identical and path-sorted")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
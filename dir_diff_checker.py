@@ -1,80 +1,282 @@
 import os
-import filecmp
 import difflib
 import argparse
 from pathlib import Path
 import html
 import sys
 import datetime
+from operator import attrgetter
+import shutil
+import tempfile
+import string
+import hashlib
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+
+try:
+    import blake3
+except ImportError:  # optional, --hash falls back to hashlib's BLAKE2b
+    blake3 = None
+
+try:
+    import diskcache
+except ImportError:  # optional, --hash digests are recomputed on every run
+    diskcache = None
+
+try:
+    from cdifflib import CSequenceMatcher
+except ImportError:  # optional, diffs use the pure-Python SequenceMatcher
+    CSequenceMatcher = None
+else:
+    # HtmlDiff/ndiff look up difflib.SequenceMatcher at call time, so swapping in
+    # the C implementation speeds up every diff this script renders
+    difflib.SequenceMatcher = CSequenceMatcher
+
+# File comparison is I/O-bound, so oversubscribe threads relative to CPUs
+MAX_COMPARE_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Cap on queued results (pending comparisons included) so memory stays flat while streaming
+MAX_PENDING_COMPARES = MAX_COMPARE_WORKERS * 4
+# Cap on queued HTML diff renders (each holds one file's diff in a worker)
+MAX_PENDING_RENDERS = (os.cpu_count() or 1) * 2
+
+# Read size for byte-by-byte comparison (filecmp uses 8 KiB)
+BLOCK_SIZE = 1 << 20
+
+# --hash digests are cached here between runs, keyed by file identity and stat
+HASH_CACHE_DIR = '.diff_cache'
+HASH_NAME = 'blake3' if blake3 is not None else 'blake2b'
+
+
+def scandir_sorted(dir_path):
+    """Return the entries of a directory sorted by name, or [] if it can't be read."""
+    try:
+        with os.scandir(dir_path) as it:
+            return sorted(it, key=attrgetter('name'))
+    except OSError:
+        return []
+
+
+def walk_files(dir_path, extensions=None):
+    """
+    Yield (relative_path, stat) for all files in a directory and its subdirectories.
+    If extensions is provided, only include files with those extensions
+    (pass a tuple to avoid a conversion; it is matched with one str.endswith call).
+    stat is the (symlink-following) os.stat_result from the scandir entry, or
+    None if the file is listed but cannot be stat'ed (e.g. a broken symlink).
+    
+    Files are yielded depth-first with each directory's entries sorted by name,
+    i.e. ordered by their list of path components, so two walks can be
+    merge-joined without holding either listing in memory.
+    
+    Uses os.scandir directly so each path is built by prefixing the parent's
+    relative path rather than with os.path.join + os.path.relpath per file.
+    Like os.walk, symlinked directories are not followed and unreadable
+    directories are skipped.
+    """
+    if extensions and not isinstance(extensions, tuple):
+        extensions = tuple(extensions)
+    stack = [("", iter(scandir_sorted(dir_path)))]
+    while stack:
+        rel_dir, entries = stack[-1]
+        entry = next(entries, None)
+        if entry is None:
+            stack.pop()
+            continue
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        if is_dir:
+            if not entry.is_symlink():
+                stack.append((rel_dir + entry.name + os.sep, iter(scandir_sorted(entry.path))))
+            continue
+        # Check if we should filter by extension
+        if extensions and not entry.name.endswith(extensions):
+            continue
+        try:
+            stat = entry.stat()
+        except OSError:
+            stat = None
+        yield rel_dir + entry.name, stat
 
 
 def get_file_list(dir_path, extensions=None):
     """
-    Get list of all files in a directory and its subdirectories.
+    Yield relative paths of all files in a directory and its subdirectories.
     If extensions is provided, only include files with those extensions.
     """
-    file_list = []
-    for root, _, files in os.walk(dir_path):
-        for file in files:
-            # Check if we should filter by extension
-            if extensions and not any(file.endswith(ext) for ext in extensions):
-                continue
-                
-            file_path = os.path.join(root, file)
-            # Get relative path to the directory
-            rel_path = os.path.relpath(file_path, dir_path)
-            file_list.append(rel_path)
-    return file_list
+    for rel_path, _ in walk_files(dir_path, extensions):
+        yield rel_path
 
 
-def compare_directories(dir1, dir2, extensions=None):
-    """Compare two directories and report differences."""
-    files1 = set(get_file_list(dir1, extensions))
-    files2 = set(get_file_list(dir2, extensions))
+def file_hash(file_path, stat=None, cache=None):
+    """
+    Return the hex content digest of a file.
+    Uses multi-threaded, memory-mapped BLAKE3 if installed, otherwise BLAKE2b.
+    If cache (a diskcache.Cache) is given, digests are stored under the file's
+    absolute path, size and mtime so unchanged files aren't re-read on later runs.
+    """
+    if cache is not None:
+        if stat is None:
+            stat = os.stat(file_path)
+        key = (HASH_NAME, os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+        digest = cache.get(key)
+        if digest is not None:
+            return digest
     
-    added = files2 - files1
-    deleted = files1 - files2
-    common = files1.intersection(files2)
+    if blake3 is not None:
+        digest = blake3.blake3(max_threads=blake3.blake3.AUTO).update_mmap(file_path).hexdigest()
+    else:
+        hasher = hashlib.blake2b()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+                hasher.update(block)
+        digest = hasher.hexdigest()
     
-    modified = []
-    identical = []
-    error_files = []
+    if cache is not None:
+        cache.set(key, digest)
+    return digest
+
+
+def fast_cmp(file1, file2, trust_mtime=False, use_hash=False, stat1=None, stat2=None, hash_cache=None):
+    """
+    Return True if two files have identical contents.
+    Files of different sizes are reported as different without being read;
+    otherwise both are read in large blocks, stopping at the first mismatch.
+    With trust_mtime, files with equal size and modification time are
+    reported as identical without being read. With use_hash, same-size
+    files are compared by content digest (see file_hash for hash_cache)
+    instead of block by block. stat1/stat2 may be passed in to reuse stat results the caller already has.
+    """
+    if stat1 is None:
+        stat1 = os.stat(file1)
+    if stat2 is None:
+        stat2 = os.stat(file2)
+    if stat1.st_size != stat2.st_size:
+        return False
+    if trust_mtime and stat1.st_mtime_ns == stat2.st_mtime_ns:
+        return True
+    if use_hash:
+        return file_hash(file1, stat1, hash_cache) == file_hash(file2, stat2, hash_cache)
     
-    # Compare common files for modifications
-    for file in common:
-        file1_path = os.path.join(dir1, file)
-        file2_path = os.path.join(dir2, file)
-        
-        try:
-            # Check if both files exist and are accessible before comparing
-            if os.path.exists(file1_path) and os.path.exists(file2_path):
-                if filecmp.cmp(file1_path, file2_path, shallow=False):
-                    identical.append(file)
-                else:
-                    modified.append(file)
+    # Buffered read(n) keeps reading until it has n bytes or hits EOF, so blocks stay
+    # aligned even where the OS returns short reads (FUSE/sshfs, interrupted reads)
+    with open(file1, 'rb') as f1, open(file2, 'rb') as f2:
+        # Both files are read front to back once: ask the kernel for aggressive readahead
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(f1.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            os.posix_fadvise(f2.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        # bytes == bytes is a single memcmp, so each block is compared in C
+        while True:
+            block1 = f1.read(BLOCK_SIZE)
+            block2 = f2.read(BLOCK_SIZE)
+            if block1 != block2:
+                return False
+            if not block1:
+                return True
+
+
+def compare_file_pair(dir1, dir2, file, stat1, stat2, trust_mtime=False, use_hash=False, hash_cache=None):
+    """
+    Compare one file present in both directories, given the stat results from walk_files.
+    Returns (status, file, error) where status is 'identical', 'modified' or 'error'.
+    """
+    # File was listed in directory walk but couldn't be stat'ed (symlink or permission issue)
+    if stat1 is None or stat2 is None:
+        return "error", file, "File exists in listing but not accessible"
+    
+    try:
+        if fast_cmp(os.path.join(dir1, file), os.path.join(dir2, file), trust_mtime, use_hash,
+                    stat1, stat2, hash_cache):
+            return "identical", file, None
+        return "modified", file, None
+    except Exception as e:
+        return "error", file, str(e)
+
+
+def iter_diff(dir1, dir2, extensions=None, trust_mtime=False, use_hash=False, hash_cache=None):
+    """
+    Compare two directories, yielding (status, file, error) tuples as differences are found.
+    status is one of 'added', 'deleted', 'modified', 'identical' or 'error'; error is
+    only set for 'error'. Results come out in path order (the same order on every run).
+    See fast_cmp for trust_mtime, use_hash and hash_cache.
+    """
+    # Both walks come out in the same sorted order, so a merge join finds
+    # added/deleted/common files without building a set of either listing.
+    # Stats come from the scandir walk, so common files need no further stat calls.
+    walk1 = ((rel.split(os.sep), rel, stat) for rel, stat in walk_files(dir1, extensions))
+    walk2 = ((rel.split(os.sep), rel, stat) for rel, stat in walk_files(dir2, extensions))
+    item1 = next(walk1, None)
+    item2 = next(walk2, None)
+    
+    # Compare common files in parallel while the walks continue. Results (finished
+    # tuples for added/deleted, futures for compared files) wait in a FIFO so they
+    # are yielded in path order; the FIFO is capped to keep memory flat.
+    with ThreadPoolExecutor(max_workers=MAX_COMPARE_WORKERS) as executor:
+        pending = deque()
+        while item1 is not None or item2 is not None:
+            if item2 is None or (item1 is not None and item1[0] < item2[0]):
+                pending.append(("deleted", item1[1], None))
+                item1 = next(walk1, None)
+            elif item1 is None or item1[0] > item2[0]:
+                pending.append(("added", item2[1], None))
+                item2 = next(walk2, None)
             else:
-                # File was listed in directory walk but doesn't exist (symlink or permission issue)
-                error_files.append((file, "File exists in listing but not accessible"))
-        except Exception as e:
-            error_files.append((file, str(e)))
+                _, file, stat1 = item1
+                stat2 = item2[2]
+                pending.append(executor.submit(compare_file_pair, dir1, dir2, file, stat1, stat2,
+                                               trust_mtime, use_hash, hash_cache))
+                item1 = next(walk1, None)
+                item2 = next(walk2, None)
+            
+            # Hand over everything at the front that is already done, and block on
+            # the oldest entry once the FIFO is full
+            while pending and (len(pending) >= MAX_PENDING_COMPARES
+                               or not isinstance(pending[0], Future) or pending[0].done()):
+                entry = pending.popleft()
+                yield entry.result() if isinstance(entry, Future) else entry
+        
+        while pending:
+            entry = pending.popleft()
+            yield entry.result() if isinstance(entry, Future) else entry
+
+
+def compare_directories(dir1, dir2, extensions=None, trust_mtime=False, use_hash=False, hash_cache=None):
+    """Compare two directories and report differences."""
+    results = {"added": [], "deleted": [], "modified": [], "identical": [], "errors": []}
+    for status, file, error in iter_diff(dir1, dir2, extensions, trust_mtime, use_hash, hash_cache):
+        if status == "error":
+            results["errors"].append((file, error))
+        else:
+            results[status].append(file)
     
-    return {
-        "added": sorted(list(added)),
-        "deleted": sorted(list(deleted)),
-        "modified": sorted(modified),
-        "identical": sorted(identical),
-        "errors": sorted(error_files)
-    }
+    for files in results.values():
+        files.sort()
+    return results
+
+
+def read_lines(file_path):
+    """Read a text file as a list of lines, replacing undecodable bytes."""
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        return f.readlines()
+
+
+def read_file_pair(file1, file2):
+    """
+    Read two text files concurrently and return both line lists.
+    On network filesystems this costs max(t1, t2) instead of t1 + t2.
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future2 = executor.submit(read_lines, file2)
+        content1 = read_lines(file1)
+        return content1, future2.result()
 
 
 def show_file_diff(file1, file2):
     """Show the differences between two files."""
     try:
-        with open(file1, 'r', encoding='utf-8', errors='replace') as f1:
-            content1 = f1.readlines()
-        
-        with open(file2, 'r', encoding='utf-8', errors='replace') as f2:
-            content2 = f2.readlines()
+        content1, content2 = read_file_pair(file1, file2)
         
         diff = difflib.unified_diff(
             content1, content2,
@@ -91,11 +293,7 @@ def show_file_diff(file1, file2):
 def generate_html_diff(file1, file2, file_path):
     """Generate HTML diff output for two files."""
     try:
-        with open(file1, 'r', encoding='utf-8', errors='replace') as f1:
-            content1 = f1.readlines()
-        
-        with open(file2, 'r', encoding='utf-8', errors='replace') as f2:
-            content2 = f2.readlines()
+        content1, content2 = read_file_pair(file1, file2)
         
         # Generate HTML diff
         diff_html = difflib.HtmlDiff(tabsize=4, wrapcolumn=80).make_file(
@@ -205,6 +403,28 @@ def generate_html_diff(file1, file2, file_path):
         return f"<html><body><h2>Error generating diff</h2><p>{html.escape(str(e))}</p></body></html>"
 
 
+def render_html_diff(dir1, dir2, file, diff_dir):
+    """
+    Write the HTML diff for one modified file into diff_dir.
+    Returns (file, diff_file_path).
+    Module-level so it can run in a worker process.
+    """
+    file_id = file.replace('/', '_').replace('\\', '_').replace('.', '_').replace(' ', '_')
+    diff_file = os.path.join(diff_dir, f"{file_id}.html")
+    
+    # Generate diff HTML file
+    diff_html = generate_html_diff(
+        os.path.join(dir1, file),
+        os.path.join(dir2, file),
+        file
+    )
+    
+    with open(diff_file, 'w', encoding='utf-8') as f:
+        f.write(diff_html)
+    
+    return file, diff_file
+
+
 def get_file_type(file_path):
     """Get file type based on extension for syntax highlighting."""
     ext = os.path.splitext(file_path)[1].lower()
@@ -224,45 +444,21 @@ def get_file_type(file_path):
         return 'text'
 
 
-def generate_html_report(results, dir1, dir2, output_path=None, extensions=None):
-    """Generate HTML report with clickable diff links."""
-    # Create output directory for diff files
-    if output_path:
-        output_dir = os.path.dirname(output_path)
-        diff_dir = os.path.join(output_dir, 'diffs')
-    else:
-        diff_dir = 'diffs'
-    
-    os.makedirs(diff_dir, exist_ok=True)
-    
-    # Generate diff files for each modified file
-    diff_files = {}
-    for file in results['modified']:
-        file_id = file.replace('/', '_').replace('\\', '_').replace('.', '_').replace(' ', '_')
-        diff_file = os.path.join(diff_dir, f"{file_id}.html")
-        
-        # Generate diff HTML file
-        diff_html = generate_html_diff(
-            os.path.join(dir1, file),
-            os.path.join(dir2, file),
-            file
-        )
-        
-        with open(diff_file, 'w', encoding='utf-8') as f:
-            f.write(diff_html)
-        
-        # Store relative path for linking
-        diff_files[file] = os.path.relpath(diff_file, os.path.dirname(output_path) if output_path else '.')
-    
-    # Generate main HTML report
-    html_content = f'''<!DOCTYPE html>
+# HTML report pieces, written to the report file one after another so the
+# report is streamed to disk instead of being built up as one string.
+# string.Template is used for the larger pieces since CSS braces clash with str.format.
+# Counts in the header aren't known until the comparison finishes, so they are
+# written as fixed-width fields and patched in place at the end. The field is
+# padded with an HTML comment so the padding doesn't render.
+REPORT_COUNT_WIDTH = 20
+REPORT_HEADER = string.Template('''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Directory Comparison Report</title>
     <style>
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Helvetica, Arial, sans-serif;
             line-height: 1.6;
             color: #24292e;
@@ -270,90 +466,90 @@ def generate_html_report(results, dir1, dir2, output_path=None, extensions=None)
             margin: 0 auto;
             padding: 20px;
             background-color: #f6f8fa;
-        }}
-        h1, h2, h3 {{
+        }
+        h1, h2, h3 {
             color: #24292e;
-        }}
-        .summary {{
+        }
+        .summary {
             background-color: #fff;
             border-radius: 6px;
             padding: 16px;
             margin-bottom: 24px;
             box-shadow: 0 1px 3px rgba(0,0,0,0.12);
             border: 1px solid #e1e4e8;
-        }}
-        .summary-row {{
+        }
+        .summary-row {
             display: flex;
             margin-bottom: 12px;
-        }}
-        .summary-label {{
+        }
+        .summary-label {
             font-weight: 600;
             width: 150px;
             color: #586069;
-        }}
-        .modified-list {{
+        }
+        .modified-list {
             border: 1px solid #e1e4e8;
             border-radius: 6px;
             margin-bottom: 24px;
             background-color: #fff;
             overflow: hidden;
-        }}
-        .modified-title {{
+        }
+        .modified-title {
             background-color: #f1f8ff;
             color: #0366d6;
             padding: 12px 16px;
             border-bottom: 1px solid #e1e4e8;
             font-weight: 600;
-        }}
-        .file-item {{
+        }
+        .file-item {
             padding: 8px 16px;
             border-bottom: 1px solid #eaecef;
             display: flex;
             align-items: center;
-        }}
-        .file-item:last-child {{
+        }
+        .file-item:last-child {
             border-bottom: none;
-        }}
-        .file-item:hover {{
+        }
+        .file-item:hover {
             background-color: #f6f8fa;
-        }}
-        .file-item a {{
+        }
+        .file-item a {
             text-decoration: none;
             color: #0366d6;
             flex-grow: 1;
-        }}
-        .file-item a:hover {{
+        }
+        .file-item a:hover {
             text-decoration: underline;
-        }}
-        .file-icon {{
+        }
+        .file-icon {
             margin-right: 12px;
             color: #586069;
-        }}
-        .section {{
+        }
+        .section {
             margin-bottom: 30px;
-        }}
-        .section-title {{
+        }
+        .section-title {
             border-bottom: 1px solid #e1e4e8;
             padding-bottom: 8px;
             margin-bottom: 16px;
             color: #24292e;
-        }}
-        .added {{
+        }
+        .added {
             color: #28a745;
-        }}
-        .deleted {{
+        }
+        .deleted {
             color: #d73a49;
-        }}
-        .modified {{
+        }
+        .modified {
             color: #f9c513;
-        }}
-        .error {{
+        }
+        .error {
             color: #cb2431;
-        }}
-        .collapsible {{
+        }
+        .collapsible {
             margin-top: 24px;
-        }}
-        .collapsible-header {{
+        }
+        .collapsible-header {
             background-color: #fff;
             padding: 12px 16px;
             cursor: pointer;
@@ -363,11 +559,11 @@ def generate_html_report(results, dir1, dir2, output_path=None, extensions=None)
             justify-content: space-between;
             align-items: center;
             box-shadow: 0 1px 2px rgba(0,0,0,0.05);
-        }}
-        .collapsible-header:hover {{
+        }
+        .collapsible-header:hover {
             background-color: #f6f8fa;
-        }}
-        .collapsible-content {{
+        }
+        .collapsible-content {
             display: none;
             padding: 0;
             max-height: 0;
@@ -378,13 +574,13 @@ def generate_html_report(results, dir1, dir2, output_path=None, extensions=None)
             border-radius: 0 0 6px 6px;
             background-color: #fff;
             transition: max-height 0.3s ease-out;
-        }}
-        .show-content {{
+        }
+        .show-content {
             display: block;
             max-height: 1000px; /* adjust as needed */
             padding: 0;
-        }}
-        .count-badge {{
+        }
+        .count-badge {
             background-color: #eaf5ff;
             border: 1px solid #c8e1ff;
             border-radius: 20px;
@@ -392,127 +588,102 @@ def generate_html_report(results, dir1, dir2, output_path=None, extensions=None)
             font-size: 0.85em;
             color: #0366d6;
             font-weight: 600;
-        }}
-        .timestamp {{
+        }
+        .timestamp {
             font-style: italic;
             color: #586069;
             font-size: 0.9em;
             margin-top: 5px;
             margin-bottom: 20px;
-        }}
+        }
     </style>
 </head>
 <body>
     <h1>Directory Comparison Report</h1>
     
     <div class="timestamp">
-        Generated on {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+        Generated on $timestamp
     </div>
     
     <div class="summary">
         <div class="summary-row">
             <div class="summary-label">Original Directory:</div>
-            <div>{html.escape(dir1)}</div>
+            <div>$dir1</div>
         </div>
         <div class="summary-row">
             <div class="summary-label">Modified Directory:</div>
-            <div>{html.escape(dir2)}</div>
+            <div>$dir2</div>
         </div>
-        {f'<div class="summary-row"><div class="summary-label">File Extensions:</div><div>{", ".join(extensions)}</div></div>' if extensions else ''}
+        $extensions_row
         <div class="summary-row">
             <div class="summary-label">Modified Files:</div>
-            <div><strong>{len(results["modified"])}</strong></div>
+            <div><strong>$modified_count</strong></div>
         </div>
         <div class="summary-row">
             <div class="summary-label">Added Files:</div>
-            <div><strong>{len(results["added"])}</strong></div>
+            <div><strong>$added_count</strong></div>
         </div>
         <div class="summary-row">
             <div class="summary-label">Deleted Files:</div>
-            <div><strong>{len(results["deleted"])}</strong></div>
+            <div><strong>$deleted_count</strong></div>
         </div>
         <div class="summary-row">
             <div class="summary-label">Identical Files:</div>
-            <div><strong>{len(results["identical"])}</strong></div>
+            <div><strong>$identical_count</strong></div>
         </div>
         <div class="summary-row">
             <div class="summary-label">Files with Errors:</div>
-            <div><strong>{len(results["errors"])}</strong></div>
+            <div><strong>$error_count</strong></div>
         </div>
     </div>
     
     <!-- Modified Files Section -->
     <div class="section">
-        <h2 class="section-title">Modified Files <span class="count-badge">{len(results["modified"])}</span></h2>
+        <h2 class="section-title">Modified Files <span class="count-badge">$modified_count</span></h2>
         
-        {f"<p>No modified files found.</p>" if not results["modified"] else ""}
-        
-        <div class="modified-list">
-            {''.join([f"""
+        <div class="modified-list">''')
+
+EXTENSIONS_ROW = '<div class="summary-row"><div class="summary-label">File Extensions:</div><div>%s</div></div>'
+
+MODIFIED_ROW = '''
             <div class="file-item">
                 <span class="file-icon modified">📝</span>
-                <a href="{html.escape(diff_files[file])}" target="_blank">{html.escape(file)}</a>
+                <a href="%s" target="_blank">%s</a>
             </div>
-            """ for file in results["modified"]])}
-        </div>
-    </div>
-    
-    <!-- Added Files Section -->
-    <div class="collapsible">
-        <div class="collapsible-header" onclick="toggleSection('added-files')">
-            <h2 style="margin: 0;">Added Files <span class="count-badge">{len(results["added"])}</span></h2>
-            <span class="toggle-icon">▼</span>
-        </div>
-        <div id="added-files" class="collapsible-content">
-            {f"<p style='padding: 16px;'>No added files found.</p>" if not results["added"] else ""}
-            
-            {''.join([f"""
-            <div class="file-item">
-                <span class="file-icon added">➕</span>
-                <span>{html.escape(file)}</span>
-            </div>
-            """ for file in results["added"]])}
-        </div>
-    </div>
-    
-    <!-- Deleted Files Section -->
-    <div class="collapsible">
-        <div class="collapsible-header" onclick="toggleSection('deleted-files')">
-            <h2 style="margin: 0;">Deleted Files <span class="count-badge">{len(results["deleted"])}</span></h2>
-            <span class="toggle-icon">▼</span>
-        </div>
-        <div id="deleted-files" class="collapsible-content">
-            {f"<p style='padding: 16px;'>No deleted files found.</p>" if not results["deleted"] else ""}
-            
-            {''.join([f"""
-            <div class="file-item">
-                <span class="file-icon deleted">➖</span>
-                <span>{html.escape(file)}</span>
-            </div>
-            """ for file in results["deleted"]])}
+            '''
+
+MODIFIED_SECTION_END = string.Template('''
         </div>
+        $no_modified
     </div>
-    
-    <!-- Error Files Section -->
+    ''')
+
+COLLAPSIBLE_SECTION_START = string.Template('''
+    <!-- $title Section -->
     <div class="collapsible">
-        <div class="collapsible-header" onclick="toggleSection('error-files')">
-            <h2 style="margin: 0;">Files with Errors <span class="count-badge">{len(results["errors"])}</span></h2>
+        <div class="collapsible-header" onclick="toggleSection('$section_id')">
+            <h2 style="margin: 0;">$title <span class="count-badge">$count</span></h2>
             <span class="toggle-icon">▼</span>
         </div>
-        <div id="error-files" class="collapsible-content">
-            {f"<p style='padding: 16px;'>No files with errors found.</p>" if not results["errors"] else ""}
-            
-            {''.join([f"""
+        <div id="$section_id" class="collapsible-content">
+            $empty_message
+            ''')
+
+FILE_ROW = '''
             <div class="file-item">
-                <span class="file-icon error">⚠️</span>
-                <span>{html.escape(file)}: {html.escape(error)}</span>
+                <span class="file-icon %s">%s</span>
+                <span>%s</span>
             </div>
-            """ for file, error in results["errors"]])}
+            '''
+
+COLLAPSIBLE_SECTION_END = '''
         </div>
     </div>
-    
+    '''
+
+REPORT_FOOTER = '''
     <script>
-    function toggleSection(id) {{
+    function toggleSection(id) {
         const content = document.getElementById(id);
         content.classList.toggle('show-content');
         
@@ -520,21 +691,135 @@ def generate_html_report(results, dir1, dir2, output_path=None, extensions=None)
         const header = content.previousElementSibling;
         const icon = header.querySelector('.toggle-icon');
         icon.textContent = content.classList.contains('show-content') ? '▲' : '▼';
-    }}
+    }
     </script>
 </body>
 </html>
 '''
+
+
+def format_report_count(count):
+    """Render a count as a fixed-width field for patching into the report header."""
+    text = str(count)
+    return f"{text}<!--{' ' * (REPORT_COUNT_WIDTH - len(text) - 7)}-->"
+
+
+def write_collapsible_section(f, section_id, title, count, empty_message, rows):
+    """Write one collapsible report section; rows is a spool file of rendered HTML rows."""
+    f.write(COLLAPSIBLE_SECTION_START.substitute(
+        section_id=section_id,
+        title=title,
+        count=count,
+        empty_message=f"<p style='padding: 16px;'>{empty_message}</p>" if not count else ""
+    ))
+    rows.seek(0)
+    shutil.copyfileobj(rows, f)
+    f.write(COLLAPSIBLE_SECTION_END)
+
+
+def generate_html_report(diff_stream, dir1, dir2, output_path=None, extensions=None):
+    """
+    Generate HTML report with clickable diff links.
+    diff_stream is an iterable of (status, file, error) tuples as produced by iter_diff.
     
-    # Write the HTML report
+    The report is written incrementally: the header goes out first, a modified
+    file's row is appended as soon as its diff page has been rendered, and the
+    summary counts are patched into the header once the stream is exhausted.
+    Added/deleted/error rows are spooled to temporary files until their sections
+    are reached, so memory use doesn't grow with the number of files.
+    """
+    # Create output directory for diff files
     if output_path:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        return output_path
+        output_dir = os.path.dirname(output_path)
+        diff_dir = os.path.join(output_dir, 'diffs')
     else:
-        with open('comparison_report.html', 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        return 'comparison_report.html'
+        diff_dir = 'diffs'
+    
+    os.makedirs(diff_dir, exist_ok=True)
+    
+    report_path = output_path or 'comparison_report.html'
+    link_base = os.path.dirname(output_path) if output_path else '.'
+    counts = dict.fromkeys(("added", "deleted", "modified", "identical", "error"), 0)
+    
+    with open(report_path, 'w', encoding='utf-8') as f, \
+            tempfile.TemporaryFile('w+', encoding='utf-8') as added_rows, \
+            tempfile.TemporaryFile('w+', encoding='utf-8') as deleted_rows, \
+            tempfile.TemporaryFile('w+', encoding='utf-8') as error_rows:
+        # Write the header with blank count fields, remembering where each one is
+        header = REPORT_HEADER.substitute(
+            timestamp=datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            dir1=html.escape(dir1),
+            dir2=html.escape(dir2),
+            extensions_row=EXTENSIONS_ROW % html.escape(", ".join(extensions)) if extensions else '',
+            modified_count='\0modified\0',
+            added_count='\0added\0',
+            deleted_count='\0deleted\0',
+            identical_count='\0identical\0',
+            error_count='\0error\0'
+        )
+        count_fields = []
+        for i, part in enumerate(header.split('\0')):
+            if i % 2:
+                count_fields.append((f.tell(), part))
+                f.write(format_report_count(''))
+            else:
+                f.write(part)
+        
+        def write_modified_rows(futures):
+            for future in futures:
+                file, diff_file = future.result()
+                # Link relative to the report's location
+                f.write(MODIFIED_ROW % (html.escape(os.path.relpath(diff_file, link_base)), html.escape(file)))
+            f.flush()
+        
+        # Render diff pages for modified files in worker processes (HtmlDiff is
+        # pure-Python and CPU-bound) and append each row as its page is done.
+        # Workers start while iter_diff's compare threads (and BLAKE3/diskcache
+        # threads with --hash) are running, so they must not be forked from this
+        # process: use a forkserver, or spawn where that isn't available.
+        start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        with ProcessPoolExecutor(mp_context=multiprocessing.get_context(start_method)) as executor:
+            pending = set()
+            for status, file, error in diff_stream:
+                counts[status] += 1
+                if status == "added":
+                    added_rows.write(FILE_ROW % ('added', '➕', html.escape(file)))
+                elif status == "deleted":
+                    deleted_rows.write(FILE_ROW % ('deleted', '➖', html.escape(file)))
+                elif status == "error":
+                    error_rows.write(FILE_ROW % ('error', '⚠️', f"{html.escape(file)}: {html.escape(error)}"))
+                elif status == "modified":
+                    pending.add(executor.submit(render_html_diff, dir1, dir2, file, diff_dir))
+                
+                if pending:
+                    done, pending = wait(pending, timeout=0, return_when=FIRST_COMPLETED)
+                    if len(pending) >= MAX_PENDING_RENDERS:
+                        more_done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        done |= more_done
+                    write_modified_rows(done)
+            
+            write_modified_rows(as_completed(pending))
+        
+        f.write(MODIFIED_SECTION_END.substitute(
+            no_modified="<p>No modified files found.</p>" if not counts["modified"] else ""
+        ))
+        write_collapsible_section(
+            f, 'added-files', 'Added Files', counts["added"], 'No added files found.', added_rows
+        )
+        write_collapsible_section(
+            f, 'deleted-files', 'Deleted Files', counts["deleted"], 'No deleted files found.', deleted_rows
+        )
+        write_collapsible_section(
+            f, 'error-files', 'Files with Errors', counts["error"], 'No files with errors found.', error_rows
+        )
+        f.write(REPORT_FOOTER)
+        
+        # Patch the final counts into the header
+        for position, status in count_fields:
+            f.seek(position)
+            f.write(format_report_count(counts[status]))
+    
+    return report_path
 
 
 def main():
@@ -546,6 +831,12 @@ def main():
     parser.add_argument('--extensions', help='Only compare files with specified extensions (comma-separated, e.g., ".c,.h")')
     parser.add_argument('--html', action='store_true', help='Generate HTML report')
     parser.add_argument('--html-output', help='HTML report output file path')
+    parser.add_argument('--trust-mtime', action='store_true',
+                        help='Treat files with the same size and modification time as identical without reading them')
+    parser.add_argument('--hash', action='store_true',
+                        help='Compare same-size files by content hash (BLAKE3 if installed) instead of byte by byte')
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f"With --hash, don't reuse or store digests in '{HASH_CACHE_DIR}' (requires diskcache)")
     
     args = parser.parse_args()
     
@@ -553,11 +844,16 @@ def main():
     dir2 = args.dir2
     
     # Process extensions if provided
+    # Normalized once into a tuple so the walk filters each name with a single
+    # C-level str.endswith call
     extensions = None
     if args.extensions:
-        extensions = args.extensions.split(',')
-        # Ensure all extensions have a dot prefix
-        extensions = [ext if ext.startswith('.') else '.' + ext for ext in extensions]
+        # Ensure all extensions have a dot prefix, ignoring blanks (e.g. a trailing comma)
+        extensions = tuple(
+            ext if ext.startswith('.') else '.' + ext
+            for ext in (ext.strip() for ext in args.extensions.split(','))
+            if ext
+        ) or None
     
     # Validate directories
     if not os.path.isdir(dir1):
@@ -568,71 +864,71 @@ def main():
         print(f"Error: {dir2} is not a valid directory")
         return
     
+    # Reuse file digests from earlier --hash runs when diskcache is available
+    hash_cache = None
+    if args.hash and not args.no_cache and diskcache is not None:
+        hash_cache = diskcache.Cache(HASH_CACHE_DIR)
+    
     # Compare directories
     print(f"Comparing directories:\n  {dir1}\n  {dir2}")
     if extensions:
         print(f"Only comparing files with extensions: {', '.join(extensions)}")
     print()
     
-    results = compare_directories(dir1, dir2, extensions)
-    
     # Generate HTML report if requested
     if args.html or args.html_output:
         html_output = args.html_output if args.html_output else 'comparison_report.html'
-        report_path = generate_html_report(results, dir1, dir2, html_output, extensions)
+        diff_stream = iter_diff(dir1, dir2, extensions, args.trust_mtime, args.hash, hash_cache)
+        report_path = generate_html_report(diff_stream, dir1, dir2, html_output, extensions)
         print(f"HTML report generated: {report_path}")
         return
     
-    # Otherwise, generate text report
-    output = []
-    output.append(f"Comparing: {dir1} and {dir2}")
-    if extensions:
-        output.append(f"File extensions filter: {', '.join(extensions)}")
-    output.append("")
-    
-    output.append(f"Added files ({len(results['added'])}):")
-    for file in results['added']:
-        output.append(f"  + {file}")
-    
-    output.append(f"\nDeleted files ({len(results['deleted'])}):")
-    for file in results['deleted']:
-        output.append(f"  - {file}")
-    
-    output.append(f"\nModified files ({len(results['modified'])}):")
-    for file in results['modified']:
-        output.append(f"  * {file}")
+    # Otherwise, stream a text report as differences are found
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        out.write(f"Comparing: {dir1} and {dir2}\n")
+        if extensions:
+            out.write(f"File extensions filter: {', '.join(extensions)}\n")
+        out.write("\n")
         
-        if args.show_diff:
-            output.append("\n  Differences:")
-            file1_path = os.path.join(dir1, file)
-            file2_path = os.path.join(dir2, file)
-            
-            try:
-                diff = show_file_diff(file1_path, file2_path)
-                # Indent the diff output
-                diff_lines = diff.split('\n')
-                indented_diff = ['    ' + line for line in diff_lines]
-                output.append('\n'.join(indented_diff))
-                output.append("")
-            except Exception as e:
-                output.append(f"    Error generating diff: {str(e)}")
-    
-    output.append(f"\nIdentical files: {len(results['identical'])}")
-    
-    if results['errors']:
-        output.append(f"\nFiles with errors ({len(results['errors'])}):")
-        for file, error in results['errors']:
-            output.append(f"  ! {file}: {error}")
-    
-    # Print summary
-    summary = '\n'.join(output)
+        counts = dict.fromkeys(("added", "deleted", "modified", "identical", "error"), 0)
+        for status, file, error in iter_diff(dir1, dir2, extensions, args.trust_mtime, args.hash, hash_cache):
+            counts[status] += 1
+            if status == "added":
+                out.write(f"  + {file}\n")
+            elif status == "deleted":
+                out.write(f"  - {file}\n")
+            elif status == "error":
+                out.write(f"  ! {file}: {error}\n")
+            elif status == "modified":
+                out.write(f"  * {file}\n")
+                
+                if args.show_diff:
+                    out.write("\n  Differences:\n")
+                    file1_path = os.path.join(dir1, file)
+                    file2_path = os.path.join(dir2, file)
+                    
+                    try:
+                        diff = show_file_diff(file1_path, file2_path)
+                        # Indent the diff output
+                        for line in diff.split('\n'):
+                            out.write(f"    {line}\n")
+                        out.write("\n")
+                    except Exception as e:
+                        out.write(f"    Error generating diff: {str(e)}\n")
+        
+        # Print summary
+        out.write(f"\nAdded files: {counts['added']}\n")
+        out.write(f"Deleted files: {counts['deleted']}\n")
+        out.write(f"Modified files: {counts['modified']}\n")
+        out.write(f"Identical files: {counts['identical']}\n")
+        out.write(f"Files with errors: {counts['error']}\n")
+    finally:
+        if args.output:
+            out.close()
     
     if args.output:
-        with open(args.output, 'w', encoding='utf-8') as f:
-            f.write(summary)
         print(f"Report saved to {args.output}")
-    else:
-        print(summary)
 
 
 if __name__ == "__main__":